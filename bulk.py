@@ -0,0 +1,216 @@
+import engine
+import os
+import json
+import hashlib
+import string
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional, Tuple, Dict, Any, Callable
+
+# Constants
+MANIFEST_NAME = ".crypt_manifest.json"
+CIPHER_SUFFIX = ".enc"
+KEYS_SUFFIX = ".keys"
+CHECKPOINT_SUFFIX = ".ckpt"
+CHUNKS_PER_BLOCK = 512  # split_chunks tokens encrypted between checkpoints
+
+# Manifest record statuses
+PENDING = "PENDING"
+PARTIAL = "PARTIAL"
+DONE = "DONE"
+ERROR = "ERROR"
+
+def file_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def load_manifest(root: str) -> Dict[str, Any]:
+    """
+    Loads the checkpoint manifest of a bulk job, or returns an empty one.
+    """
+    path = os.path.join(root, MANIFEST_NAME)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"Error loading manifest, starting over: {e}")
+    return {"files": {}}
+
+def save_manifest(manifest: Dict[str, Any], root: str) -> None:
+    """
+    Writes the manifest atomically so a crash never leaves it half-written.
+    """
+    path = os.path.join(root, MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+def collect_files(root: str) -> List[str]:
+    """
+    Walks the tree and returns input file paths relative to root, skipping job outputs.
+    """
+    files = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if name.startswith(MANIFEST_NAME) or name.endswith((CIPHER_SUFFIX, KEYS_SUFFIX, CHECKPOINT_SUFFIX, CHECKPOINT_SUFFIX + ".tmp")):
+                continue
+            files.append(os.path.relpath(os.path.join(dirpath, name), root))
+    return sorted(files)
+
+def _truncate(path: str, size: int) -> None:
+    # Drops anything written after the last checkpoint (or everything when size is 0)
+    with open(path, 'ab') as f:
+        f.truncate(size)
+
+def _output_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return -1
+
+def _outputs_cover(path: str, record: Dict[str, Any]) -> bool:
+    """
+    True if <file>.enc and <file>.keys both exist and hold at least the recorded bytes.
+    """
+    return (_output_size(path + CIPHER_SUFFIX) >= record.get("cipher_bytes", 0)
+            and _output_size(path + KEYS_SUFFIX) >= record.get("keys_bytes", 0))
+
+def encrypt_file(path: str, record: Dict[str, Any], alphabet: List[str], shift: int,
+                 checkpoint: Callable[[], None]) -> None:
+    """
+    Encrypts one file block by block, writing <file>.enc and <file>.keys next to it.
+    Progress is stored in 'record' and flushed via 'checkpoint' after every block,
+    so a PARTIAL record with a matching hash resumes at its last finished block.
+    """
+    stat = os.stat(path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = file_digest(data)
+
+    # Resume only if the outputs still hold everything the checkpoint claims;
+    # truncating a missing/short file to the offset would pad it with NULs
+    if (record.get("status") != PARTIAL or record.get("sha256") != digest
+            or not _outputs_cover(path, record)):
+        record.update({"blocks_done": 0, "cipher_bytes": 0, "keys_bytes": 0})
+    record.update({"size": stat.st_size, "mtime": stat.st_mtime, "sha256": digest})
+
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        record["status"] = ERROR
+        record["error"] = "Not a UTF-8 text file"
+        checkpoint()
+        return
+
+    cipher_path = path + CIPHER_SUFFIX
+    keys_path = path + KEYS_SUFFIX
+    _truncate(cipher_path, record["cipher_bytes"])
+    _truncate(keys_path, record["keys_bytes"])
+
+    chunks = engine.split_chunks(text, alphabet)
+    with open(cipher_path, 'ab') as cipher_f, open(keys_path, 'ab') as keys_f:
+        for start in range(record["blocks_done"] * CHUNKS_PER_BLOCK, len(chunks), CHUNKS_PER_BLOCK):
+            block = engine.join_chunks(chunks[start:start + CHUNKS_PER_BLOCK])
+            encrypted, keys, _ = engine.encrypt_sentence_otp(block, alphabet, shift)
+            cipher_f.write(encrypted.encode('utf-8'))
+            keys_f.write(''.join(key + '\n' for key in keys).encode('utf-8'))
+            # Data must be durable before the checkpoint that points past it
+            cipher_f.flush()
+            keys_f.flush()
+            os.fsync(cipher_f.fileno())
+            os.fsync(keys_f.fileno())
+
+            record["blocks_done"] += 1
+            record["cipher_bytes"] = cipher_f.tell()
+            record["keys_bytes"] = keys_f.tell()
+            record["status"] = PARTIAL
+            checkpoint()
+
+    record["status"] = DONE
+    record.pop("error", None)
+    checkpoint()
+
+def _process_file(root: str, rel_path: str, record: Dict[str, Any], alphabet: List[str],
+                  shift: int) -> Tuple[Dict[str, Any], str]:
+    """
+    Worker task for one file; returns (final record, status).
+    Block checkpoints go to a small <file>.ckpt sidecar, which takes precedence
+    over the manifest record because it is newer. Any failure becomes an ERROR record.
+    """
+    path = os.path.join(root, rel_path)
+    sidecar = path + CHECKPOINT_SUFFIX
+
+    def checkpoint() -> None:
+        tmp_path = sidecar + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(record, f)
+        os.replace(tmp_path, sidecar)
+
+    try:
+        if os.path.exists(sidecar):
+            with open(sidecar, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        record = dict(record)
+        stat = os.stat(path)
+        if (record.get("status") == DONE and record.get("size") == stat.st_size
+                and record.get("mtime") == stat.st_mtime
+                and _output_size(path + CIPHER_SUFFIX) == record.get("cipher_bytes")
+                and _output_size(path + KEYS_SUFFIX) == record.get("keys_bytes")):
+            return record, "SKIPPED"
+        encrypt_file(path, record, alphabet, shift, checkpoint)
+    except Exception as e:
+        record = dict(record, status=ERROR, error=f"{type(e).__name__}: {e}")
+    return record, record["status"]
+
+def _remove_sidecars(root: str, files: List[str]) -> None:
+    for rel_path in files:
+        try:
+            os.remove(os.path.join(root, rel_path) + CHECKPOINT_SUFFIX)
+        except FileNotFoundError:
+            pass
+
+def run_bulk_job(root: str, alphabet: Optional[List[str]] = None, shift: int = 1, workers: Optional[int] = None,
+                 progress: Optional[Callable[[str, str], None]] = None) -> Dict[str, int]:
+    """
+    Encrypts every file under 'root' across a pool of 'workers' processes.
+    The manifest in root records path, size, mtime, sha256 and status per file.
+    Workers checkpoint into per-file sidecars; the parent merges their final records
+    and rewrites the manifest once at the end, then removes the sidecars.
+    Re-running the job skips DONE files whose size/mtime are unchanged and
+    whose outputs still have their recorded sizes.
+    Returns a count of files per final status, plus "SKIPPED".
+    """
+    if alphabet is None:
+        alphabet = list(string.ascii_uppercase)
+
+    files = collect_files(root)
+    manifest = load_manifest(root)
+    # Partial output is only resumable with the settings it was written with
+    if manifest.get("alphabet") != alphabet or manifest.get("shift") != shift:
+        manifest = {"alphabet": alphabet, "shift": shift, "files": {}}
+        _remove_sidecars(root, files)
+        save_manifest(manifest, root)
+
+    summary = {DONE: 0, ERROR: 0, "SKIPPED": 0}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_process_file, root, rel_path, manifest["files"].get(rel_path, {"status": PENDING}),
+                        alphabet, shift): rel_path
+            for rel_path in files
+        }
+        for future in as_completed(futures):
+            rel_path = futures[future]
+            try:
+                record, status = future.result()
+            except Exception as e:
+                # Worker died or the task could not be pickled; the sidecar (if any) survives for the next run
+                record = dict(manifest["files"].get(rel_path, {}), status=ERROR, error=f"{type(e).__name__}: {e}")
+                status = ERROR
+            manifest["files"][rel_path] = record
+            summary[status] += 1
+            if progress:
+                progress(rel_path, status)
+
+    save_manifest(manifest, root)
+    _remove_sidecars(root, files)
+    return summary
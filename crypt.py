@@ -1,4 +1,5 @@
 import engine
+import bulk
 import sys
 import os
 import string
@@ -37,7 +38,7 @@ def clear_screen():
 def pause():
     input("[Press Enter]")
 
-def add_history_entry(msg: str, result: str, status: str, keys: List[str] = None, mapping: List[Dict] = None):
+def add_history_entry(msg: str, result: str, status: str, keys: List[str] = None, mapping: List[Dict] = None, delta: Dict = None, settings: Dict = None):
     entry = {
         "msg": msg,
         "result": result,
@@ -46,8 +47,30 @@ def add_history_entry(msg: str, result: str, status: str, keys: List[str] = None
         "status": status,
         "timestamp": datetime.datetime.now().isoformat()
     }
+    if delta is not None:
+        entry["delta"] = delta
+    if settings is not None:
+        entry.update(settings)
     current_data["entries"].append(entry)
 
+def current_settings() -> Dict[str, Any]:
+    """Alphabet/shift recorded on ENCODED entries so their keys can be safely reused."""
+    return {"alphabet": list(current_data["alphabet"]), "shift": current_data["shift"]}
+
+def find_previous_encoded() -> Optional[int]:
+    """
+    Index of the latest ENCODED entry before the active one that was encrypted
+    with the current alphabet/shift, or None.
+    """
+    settings = current_settings()
+    for idx in range(len(current_data["entries"]) - 2, -1, -1):
+        entry = current_data["entries"][idx]
+        if (entry.get("status") == "ENCODED" and entry.get("mapping")
+                and entry.get("alphabet") == settings["alphabet"]
+                and entry.get("shift") == settings["shift"]):
+            return idx
+    return None
+
 def print_box(lines: List[str], title: str = "MENU"):
     """Draws an ASCII box around a list of text lines."""
     width = 60
@@ -144,13 +167,32 @@ def run_encryption():
     print("\n[ ENCRYPTION ]")
     print(f"Encrypting: {active_msg[:30]}...")
     
-    encrypted_text, used_keys, mapping = engine.encrypt_sentence_otp(
-        active_msg, 
-        current_data["alphabet"], 
-        current_data["shift"]
-    )
-    
-    add_history_entry(active_msg, encrypted_text, "ENCODED", used_keys, mapping)
+    # Incremental mode: keep keys/ciphertext of chunks unchanged since the last encryption.
+    # Not offered when re-encrypting ciphertext (the base mapping holds plaintext).
+    base_idx = find_previous_encoded() if get_active_status() != "ENCODED" else None
+    incremental = False
+    if base_idx is not None:
+        choice = input(f"Reuse keys from entry [{base_idx:02}] for unchanged text? (y/n): ").strip().lower()
+        incremental = choice == 'y'
+
+    if incremental:
+        encrypted_text, used_keys, mapping, changes = engine.encrypt_sentence_incremental(
+            active_msg,
+            current_data["entries"][base_idx]["mapping"],
+            current_data["alphabet"],
+            current_data["shift"]
+        )
+        delta = {"base": base_idx, "changes": changes}
+        add_history_entry(active_msg, encrypted_text, "ENCODED", used_keys, mapping, delta, current_settings())
+        print(f">> Re-encrypted {len(changes)} changed span(s); other chunks reuse entry [{base_idx:02}].")
+    else:
+        encrypted_text, used_keys, mapping = engine.encrypt_sentence_otp(
+            active_msg, 
+            current_data["alphabet"], 
+            current_data["shift"]
+        )
+        
+        add_history_entry(active_msg, encrypted_text, "ENCODED", used_keys, mapping, settings=current_settings())
     
     print(f">> Result: {encrypted_text}")
     print("\n>> Entry added to Project history.")
@@ -257,6 +299,59 @@ def run_decryption():
         print(f"!! Decryption failed: {e}")
         pause()
 
+def run_bulk_encryption():
+    print("\n[ BULK ENCRYPTION ]")
+    print("Encrypts every file in a directory tree (writes <file>.enc and <file>.keys).")
+    root = input("Enter directory: ").strip()
+    if not root: return
+    if not os.path.isdir(root):
+        print(f"!! Directory not found: {root}")
+        pause()
+        return
+
+    try:
+        workers_str = input("Worker processes [CPU count]: ").strip()
+        workers = int(workers_str) if workers_str else None
+    except ValueError:
+        print("!! Invalid integer.")
+        pause()
+        return
+
+    def report(rel_path: str, status: str):
+        print(f"  {status:<7} | {rel_path}")
+
+    summary = bulk.run_bulk_job(root, current_data["alphabet"], current_data["shift"], workers, report)
+    print(f">> Done: {summary['DONE']}, Skipped: {summary['SKIPPED']}, Errors: {summary['ERROR']}")
+    print(f">> Progress saved to {os.path.join(root, bulk.MANIFEST_NAME)}; re-run to resume.")
+    pause()
+
+def run_verification():
+    print("\n[ VERIFY ]")
+    print("1. Current Project")
+    print("2. Whole Vault")
+    choice = input("Select > ").strip()
+
+    def report_progress(done: int, total: int):
+        print(f"\r  Checked {done}/{total} entries", end="", flush=True)
+
+    if choice == '1':
+        report = engine.verify_project(current_data, progress=report_progress)
+    elif choice == '2':
+        report = engine.verify_vault(progress=report_progress)
+    else:
+        return
+
+    print(f"\n>> Checked {report['checked']} entries in {report['elapsed']:.2f}s ({report['rate']:.1f} entries/s).")
+    for name in report.get("skipped", []):
+        print(f"  Skipped (no entry history): {name}")
+    if report["corrupt"]:
+        print(f"!! {len(report['corrupt'])} corrupt entries:")
+        for item in report["corrupt"]:
+            print(f"  {item['project']} [{item['index']:02}]: {'; '.join(item['problems'])}")
+    else:
+        print(">> All entries consistent.")
+    pause()
+
 # OPTIONS MENU FUNCTIONS
 
 
@@ -354,6 +449,8 @@ MAIN_MENU: Dict[str, MenuAction] = {
     "5": MenuAction("Decrypt", run_decryption),
     "6": MenuAction("Settings", menu_options),
     "7": MenuAction("View Project Details", view_state),
+    "8": MenuAction("Bulk Encrypt Directory", run_bulk_encryption),
+    "9": MenuAction("Verify Project / Vault", run_verification),
     "0": MenuAction("Exit", shutdown)
 }
 
@@ -365,7 +462,7 @@ def main():
         
         # Generate Menu Lines dynamically
         menu_items = []
-        # Sort keys to ensure order 1..7, 0
+        # Sort keys to ensure order 1..9, 0
         sorted_keys = sorted([k for k in MAIN_MENU.keys() if k != '0']) + ['0']
         
         for key in sorted_keys:
@@ -1,10 +1,15 @@
 import random
 import string
 from collections import deque
+import difflib
+import functools
 import re
 import os
 import json
-from typing import List, Optional, Tuple, Dict, Any
+import hashlib
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple, Dict, Any, Callable
 
 def build_table(alphabet: Optional[List[str]] = None, shift: int = 1) -> List[List[str]]:
     """
@@ -44,25 +49,108 @@ def pad_key(key: str, length: int, alphabet: Optional[str] = None) -> str:
     extra = ''.join(random.choices(alphabet, k=length - len(key)))
     return key + extra
 
+class _LowerTable(dict):
+    """
+    Per-char lowercase translate table. Unlike str.lower() on a whole string it
+    ignores context rules (e.g. Greek final sigma), matching c.lower() per char.
+    """
+    def __missing__(self, code: int) -> str:
+        value = chr(code).lower()
+        self[code] = value
+        return value
+
+@functools.lru_cache(maxsize=32)
+def _alphabet_tables(alphabet: Tuple[str, ...]) -> Tuple[Dict[str, int], Dict[int, None], Dict[int, str], _LowerTable]:
+    """
+    Precomputed lookups per alphabet:
+    - index: char -> first position (same as alphabet.index)
+    - strip: translate table deleting alphabet chars; anything left is passthrough
+    - case_mask: translate table turning alphabet chars (either case) into '1' (upper) / '0'
+    - lower: translate table lowercasing alphabet chars one at a time
+    """
+    index: Dict[str, int] = {}
+    case_mask: Dict[int, str] = {}
+    lower = _LowerTable()
+    for i, char in enumerate(alphabet):
+        index.setdefault(char, i)
+        # Only single chars can match a char of the text ('İ'.lower() is two chars)
+        if len(char) != 1:
+            continue
+        lower[ord(char)] = char.lower()
+        for variant in (char, char.lower()):
+            if len(variant) == 1:
+                case_mask[ord(variant)] = '1' if variant.isupper() else '0'
+    strip = dict.fromkeys(ord(char) for char in alphabet if len(char) == 1)
+    return index, strip, case_mask, lower
+
+_CASE_BITS = str.maketrans('', '', '01')
+
+# Row inverses for decrypt_word, keyed by table identity (tables are not mutated after build_table)
+_INVERSE_CACHE: Dict[int, Tuple[List[List[str]], List[Dict[str, int]]]] = {}
+_INVERSE_CACHE_SIZE = 8
+
+def _row_inverses(table: List[List[str]]) -> List[Dict[str, int]]:
+    cached = _INVERSE_CACHE.get(id(table))
+    if cached and cached[0] is table:
+        return cached[1]
+    inverses = []
+    for row in table:
+        inverse: Dict[str, int] = {}
+        for col, char in enumerate(row):
+            inverse.setdefault(char, col)
+        inverses.append(inverse)
+    if len(_INVERSE_CACHE) >= _INVERSE_CACHE_SIZE:
+        _INVERSE_CACHE.pop(next(iter(_INVERSE_CACHE)))
+    _INVERSE_CACHE[id(table)] = (table, inverses)
+    return inverses
+
+def _fast_path_mask(text: str, text_u: str, key_u: str, alphabet: List[str]) -> Optional[str]:
+    """
+    Returns the case mask ('1' = upper) when every char of text/key is in the alphabet,
+    or None if any char needs passthrough handling.
+    """
+    _, strip, case_mask, _ = _alphabet_tables(tuple(alphabet))
+    if len(text_u) != len(text) or text_u.translate(strip) or key_u[:len(text)].translate(strip):
+        return None
+    mask = text.translate(case_mask)
+    if mask.translate(_CASE_BITS):
+        return None
+    return mask
+
+def _restore_case(result_u: str, mask: str, lower: _LowerTable) -> str:
+    if '0' not in mask:
+        return result_u
+    if '1' not in mask:
+        return result_u.translate(lower)
+    return ''.join([r if m == '1' else lower[ord(r)] for r, m in zip(result_u, mask)])
+
 def encrypt_word(word: str, key: str, table: List[List[str]], alphabet: List[str]) -> Tuple[str, str]:
     """
     Encrypts each letter using the Vigenère table while preserving the original casing.
     """
-    result = ""
-    # Store original cases
-    cases = [c.isupper() for c in word]
-    
+    index, _, _, lower = _alphabet_tables(tuple(alphabet))
+
     # Work with upper version for table lookup
     word_u = word.upper()
     key_u = pad_key(key, len(word), alphabet).upper()
 
+    # Fast path: no passthrough chars, so case is folded/restored in bulk
+    mask = _fast_path_mask(word, word_u, key_u, alphabet)
+    if mask is not None:
+        result_u = ''.join([table[index[k]][index[c]] for k, c in zip(key_u, word_u)])
+        return _restore_case(result_u, mask, lower), key_u
+
+    result = ""
+    # Store original cases
+    cases = [c.isupper() for c in word]
+
     for i in range(len(word)):
-        if word_u[i] not in alphabet or key_u[i] not in alphabet:
+        if word_u[i] not in index or key_u[i] not in index:
             result += word[i]
             continue
             
-        row = alphabet.index(key_u[i])
-        col = alphabet.index(word_u[i])
+        row = index[key_u[i]]
+        col = index[word_u[i]]
         res_char = table[row][col]
         
         # Map back to original case
@@ -74,19 +162,31 @@ def decrypt_word(coded: str, key: str, table: List[List[str]], alphabet: List[st
     """
     Decrypts while preserving the original casing of the ciphertext.
     """
-    result = ""
-    cases = [c.isupper() for c in coded]
+    index, _, _, lower = _alphabet_tables(tuple(alphabet))
+    inverses = _row_inverses(table)
     coded_u = coded.upper()
     key_u = pad_key(key, len(coded), alphabet).upper()
 
+    mask = _fast_path_mask(coded, coded_u, key_u, alphabet)
+    if mask is not None:
+        try:
+            result_u = ''.join([alphabet[inverses[index[k]][c]] for k, c in zip(key_u, coded_u)])
+            return _restore_case(result_u, mask, lower)
+        except KeyError:
+            # Caller-built table whose row lacks this char (build_table rows hold the full alphabet)
+            pass
+
+    result = ""
+    cases = [c.isupper() for c in coded]
+
     for i in range(len(coded)):
-        if coded_u[i] not in alphabet or key_u[i] not in alphabet:
+        if coded_u[i] not in index or key_u[i] not in index:
             result += coded[i]
             continue
             
-        row = alphabet.index(key_u[i])
-        if coded_u[i] in table[row]:
-            col = table[row].index(coded_u[i])
+        row = index[key_u[i]]
+        if coded_u[i] in inverses[row]:
+            col = inverses[row][coded_u[i]]
             res_char = alphabet[col]
             result += res_char if cases[i] else res_char.lower()
         else:
@@ -220,6 +320,247 @@ def decrypt_sentence(ciphertext: str, keys_used: List[str], alphabet: Optional[L
             })
     return join_chunks(decrypted_chunks), mapping
 
+def encrypt_pipeline(sentence: str, shifts: List[int], alphabet: Optional[List[str]] = None) -> Tuple[str, List[str], List[Dict[str, Any]], List[List[str]]]:
+    """
+    Encrypts a sentence through several OTP rounds (one per shift) in a single pass.
+    Row r of a shift-s table is the alphabet rotated by r*s, so each round only adds
+    key_index * shift to a letter's position and the rounds fold into one offset.
+    Negative shifts are treated as 0, matching build_table (which never rotates them).
+    Returns (encrypted_sentence, effective_keys, mapping, stage_keys).
+    - effective_keys: One key per word that undoes every round at shift 1.
+    - stage_keys: Per-round key lists; decrypt the rounds in reverse order with
+      decrypt_sentence(text, stage_keys[i], alphabet, shifts[i]).
+    """
+    if alphabet is None:
+        alphabet = list(string.ascii_uppercase)
+
+    size = len(alphabet)
+    index = {char: i for i, char in enumerate(alphabet)}
+    # Per-row rotation build_table actually applies for each stage
+    rotations = [max(shift, 0) for shift in shifts]
+    chunks = split_chunks(sentence, alphabet)
+    encrypted_chunks = []
+    effective_keys = []
+    stage_keys: List[List[str]] = [[] for _ in shifts]
+    mapping = []
+
+    for chunk in chunks:
+        is_word = chunk and chunk[0].upper() in alphabet
+        if is_word:
+            offsets = [0] * len(chunk)
+            chunk_keys = []
+            for stage, rotation in enumerate(rotations):
+                word_key = random_key(len(chunk), alphabet)
+                stage_keys[stage].append(word_key)
+                chunk_keys.append(word_key)
+                for i, key_char in enumerate(word_key):
+                    offsets[i] += index[key_char] * rotation
+
+            encrypted = ""
+            for char, offset in zip(chunk, offsets):
+                res_char = alphabet[(index[char.upper()] + offset) % size]
+                encrypted += res_char if char.isupper() else res_char.lower()
+
+            effective_key = ''.join(alphabet[offset % size] for offset in offsets)
+            encrypted_chunks.append(encrypted)
+            effective_keys.append(effective_key)
+            mapping.append({
+                "original": chunk,
+                "result": encrypted,
+                "type": "WORD",
+                "key": effective_key,
+                "stage_keys": chunk_keys
+            })
+        else:
+            encrypted_chunks.append(chunk)
+            mapping.append({
+                "original": chunk,
+                "result": chunk,
+                "type": "SEP",
+                "key": None
+            })
+    return join_chunks(encrypted_chunks), effective_keys, mapping, stage_keys
+
+def _chunk_opcodes(old: List[str], new: List[str]) -> List[Tuple[str, int, int, int, int]]:
+    """
+    difflib opcodes for two chunk lists. The common prefix/suffix is stripped first,
+    so small edits to large documents only diff the edited middle. Autojunk stays on:
+    separators like " " are about half of all chunks and make the matcher quadratic.
+    """
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    old_end = len(old) - suffix
+    new_end = len(new) - suffix
+
+    opcodes = []
+    if prefix:
+        opcodes.append(("equal", 0, prefix, 0, prefix))
+    if prefix < old_end or prefix < new_end:
+        matcher = difflib.SequenceMatcher(None, old[prefix:old_end], new[prefix:new_end])
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            opcodes.append((tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix))
+    if suffix:
+        opcodes.append(("equal", old_end, len(old), new_end, len(new)))
+    return opcodes
+
+def encrypt_sentence_incremental(sentence: str, previous_mapping: List[Dict[str, Any]], alphabet: Optional[List[str]] = None, shift: int = 1) -> Tuple[str, List[str], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Re-encrypts an edited sentence against the mapping of a previous ENCODED entry.
+    Unchanged chunks keep their previous key and ciphertext; only inserted or
+    replaced chunks get fresh keys. The previous entry must use the same alphabet/shift.
+    Returns (encrypted_sentence, keys_used, mapping, delta).
+    Delta is a list of dicts: {"op": "insert|replace|delete", "old": [i1, i2], "new": [j1, j2]}
+    with chunk index ranges into the previous and new mappings.
+    """
+    if alphabet is None:
+        alphabet = list(string.ascii_uppercase)
+
+    table = build_table(alphabet, shift)
+    chunks = split_chunks(sentence, alphabet)
+    previous_chunks = [m.get("original", "") for m in previous_mapping]
+    encrypted_chunks = []
+    keys_used = []
+    mapping = []
+    delta = []
+
+    for tag, i1, i2, j1, j2 in _chunk_opcodes(previous_chunks, chunks):
+        if tag == "equal":
+            for m in previous_mapping[i1:i2]:
+                encrypted_chunks.append(m["result"])
+                if m["type"] == "WORD":
+                    keys_used.append(m["key"])
+                mapping.append(dict(m))
+            continue
+
+        delta.append({"op": tag, "old": [i1, i2], "new": [j1, j2]})
+        if tag == "delete":
+            continue
+
+        # Inserted/replaced span: same chunk handling as encrypt_sentence_otp
+        encrypted, span_keys, span_mapping = encrypt_sentence_otp(join_chunks(chunks[j1:j2]), alphabet, shift)
+        encrypted_chunks.append(encrypted)
+        keys_used.extend(span_keys)
+        mapping.extend(span_mapping)
+
+    return join_chunks(encrypted_chunks), keys_used, mapping, delta
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def verify_entry(entry: Dict[str, Any], alphabet: Optional[List[str]] = None, shift: int = 1) -> List[str]:
+    """
+    Checks one history entry for consistency and returns a list of problems (empty if OK).
+    - Mapping: joined 'original'/'result' chunks must hash to the entry's msg/result.
+    - ENCODED: mapping keys must match 'keys', and 'result' must decrypt back to 'msg'.
+    """
+    if alphabet is None:
+        alphabet = list(string.ascii_uppercase)
+
+    problems = []
+    msg_hash = _digest(entry.get("msg", ""))
+    result_hash = _digest(entry.get("result", ""))
+    mapping = entry.get("mapping", [])
+
+    if mapping:
+        if _digest("".join(m.get("original", "") for m in mapping)) != msg_hash:
+            problems.append("mapping 'original' chunks do not match msg")
+        if _digest("".join(m.get("result", "") for m in mapping)) != result_hash:
+            problems.append("mapping 'result' chunks do not match result")
+
+    if entry.get("status") == "ENCODED":
+        keys = entry.get("keys", [])
+        if mapping and [m.get("key") for m in mapping if m.get("type") == "WORD"] != keys:
+            problems.append("mapping keys do not match keys")
+        decrypted, _ = decrypt_sentence(entry.get("result", ""), keys, alphabet, shift)
+        if _digest(decrypted) != msg_hash:
+            problems.append("result does not decrypt to msg with keys")
+    return problems
+
+def _verify_task(task: Tuple[Dict[str, Any], List[str], int]) -> List[str]:
+    # Top-level so ProcessPoolExecutor can pickle it
+    entry, alphabet, shift = task
+    try:
+        return verify_entry(entry, alphabet, shift)
+    except Exception as e:
+        # Malformed entry (e.g. "keys": null): report it instead of aborting the whole run
+        return [f"malformed entry: {type(e).__name__}: {e}"]
+
+def verify_projects(projects: Dict[str, Dict[str, Any]], workers: Optional[int] = None,
+                    progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+    """
+    Verifies every entry of the given projects ({name: project data}) across a process pool.
+    Entries that record their own alphabet/shift are checked with those, not the project's.
+    Returns a report: {"checked", "corrupt", "elapsed", "rate"}.
+    Corrupt is a list of dicts: {"project": str, "index": int, "problems": List[str]}
+    """
+    tasks = []
+    refs = []
+    for name, data in projects.items():
+        alphabet = data.get("alphabet") or list(string.ascii_uppercase)
+        shift = data.get("shift", 1)
+        for idx, entry in enumerate(data.get("entries", [])):
+            # ENCODED entries record the settings they were encrypted with
+            if isinstance(entry, dict):
+                tasks.append((entry, entry.get("alphabet") or alphabet, entry.get("shift", shift)))
+            else:
+                tasks.append((entry, alphabet, shift))
+            refs.append((name, idx))
+
+    start = time.perf_counter()
+    corrupt = []
+    total = len(tasks)
+    if tasks:
+        chunksize = max(1, total // ((workers or os.cpu_count() or 1) * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for done, ((name, idx), problems) in enumerate(zip(refs, pool.map(_verify_task, tasks, chunksize=chunksize)), 1):
+                if problems:
+                    corrupt.append({"project": name, "index": idx, "problems": problems})
+                if progress:
+                    progress(done, total)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "checked": total,
+        "corrupt": corrupt,
+        "elapsed": elapsed,
+        "rate": total / elapsed if elapsed > 0 else 0.0
+    }
+
+def verify_project(data: Dict[str, Any], workers: Optional[int] = None,
+                   progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+    """
+    Verifies a single project (e.g. the workspace's current_data).
+    """
+    return verify_projects({data.get("name", "project"): data}, workers, progress)
+
+def verify_vault(workers: Optional[int] = None,
+                 progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+    """
+    Verifies every project in the 'vault' directory in one pool.
+    Files without an 'entries' history (legacy sessions) are listed under "skipped".
+    """
+    vault_dir = os.path.join(os.path.dirname(__file__), 'vault')
+    projects = {}
+    skipped = []
+    if os.path.exists(vault_dir):
+        for filename in sorted(os.listdir(vault_dir)):
+            if not filename.endswith('.json'):
+                continue
+            data = load_session_json(filename)
+            if data and isinstance(data.get("entries"), list):
+                projects[filename] = data
+            else:
+                skipped.append(filename)
+
+    report = verify_projects(projects, workers, progress)
+    report["skipped"] = skipped
+    return report
+
 def save_keys(keys: List[str], filename: str) -> bool:
     try:
         with open(filename, 'w') as f:
@@ -1,5 +1,8 @@
 import engine
+import bulk
 import os
+import tempfile
+import time
 
 def test_final_polish():
     print("--- Final Polish Verification ---")
@@ -52,5 +55,204 @@ def test_final_polish():
 
     print("\n--- ALL FINAL TESTS PASSED ---")
 
+def test_pipeline_rounds():
+    print("--- Pipeline Verification ---")
+    alphabet = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    text = "Attack at Dawn, 0600!"
+    shifts = [1, 3, 5]
+
+    enc, effective_keys, mapping, stage_keys = engine.encrypt_pipeline(text, shifts, alphabet)
+    print(f"  Cipher: {enc}")
+    assert len(stage_keys) == len(shifts), "One key list per stage"
+    assert "".join(m["result"] for m in mapping) == enc, "Mapping should line up with ciphertext"
+
+    # Fused keys undo every round at once
+    dec, _ = engine.decrypt_sentence(enc, effective_keys, alphabet, 1)
+    assert dec == text, f"Effective key mismatch: {dec} != {text}"
+
+    # Each stage can still be peeled off separately, last round first
+    for keys, shift in reversed(list(zip(stage_keys, shifts))):
+        enc, _ = engine.decrypt_sentence(enc, keys, alphabet, shift)
+    assert enc == text, f"Stage-by-stage mismatch: {enc} != {text}"
+
+    # Negative shifts behave like build_table (no row rotation)
+    shifts = [-1, 2]
+    enc, effective_keys, _, stage_keys = engine.encrypt_pipeline("Hello World", shifts, alphabet)
+    dec, _ = engine.decrypt_sentence(enc, effective_keys, alphabet, 1)
+    assert dec == "Hello World", f"Effective key mismatch with negative shift: {dec}"
+    for keys, shift in reversed(list(zip(stage_keys, shifts))):
+        enc, _ = engine.decrypt_sentence(enc, keys, alphabet, shift)
+    assert enc == "Hello World", f"Stage-by-stage mismatch with negative shift: {enc}"
+    print("  >> Pipeline PASSED")
+
+def test_incremental_reencryption():
+    print("--- Incremental Re-encryption Verification ---")
+    alphabet = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    original = "Meet me at the old mill at noon."
+    edited = "Meet me at the new mill at dusk."
+
+    _, _, base_mapping = engine.encrypt_sentence_otp(original, alphabet)
+    enc, keys, mapping, delta = engine.encrypt_sentence_incremental(edited, base_mapping, alphabet)
+    print(f"  Cipher: {enc}")
+    print(f"  Delta: {delta}")
+
+    # Only 'old' -> 'new' and 'noon' -> 'dusk' changed
+    assert [d["op"] for d in delta] == ["replace", "replace"], f"Unexpected delta: {delta}"
+    base_keys = {m["original"]: m["key"] for m in base_mapping if m["type"] == "WORD"}
+    for m in mapping:
+        if m["original"] in ("Meet", "mill", "the"):
+            assert m["key"] == base_keys[m["original"]], f"Key for '{m['original']}' should be reused"
+
+    dec, _ = engine.decrypt_sentence(enc, keys, alphabet)
+    assert dec == edited, f"Decryption mismatch: {dec} != {edited}"
+
+    # Large document, edits at both ends and in the middle: must not go quadratic
+    words = [f"word{'abcdefghij'[i % 10]}{'klmnopqrst'[i // 10 % 10]}" for i in range(8000)]
+    base_text = " ".join(words)
+    edited = " ".join(["Start"] + words[1:4000] + ["inserted"] + words[4000:-1] + ["End"])
+    _, _, base_mapping = engine.encrypt_sentence_otp(base_text, alphabet)
+    start = time.perf_counter()
+    enc, keys, _, delta = engine.encrypt_sentence_incremental(edited, base_mapping, alphabet)
+    elapsed = time.perf_counter() - start
+    print(f"  8000 words: {elapsed:.3f}s, {len(delta)} changed spans")
+    assert elapsed < 5, f"Incremental diff too slow on a large document: {elapsed:.1f}s"
+    assert len(delta) == 3, f"Unexpected delta: {delta}"
+    dec, _ = engine.decrypt_sentence(enc, keys, alphabet)
+    assert dec == edited, "Large document round trip failed"
+    print("  >> Incremental Re-encryption PASSED")
+
+def test_bulk_resume():
+    print("--- Bulk Job Verification ---")
+    alphabet = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    text = "The quick brown fox jumps over the lazy dog. " * 40
+
+    with tempfile.TemporaryDirectory() as root:
+        os.makedirs(os.path.join(root, "sub"))
+        for rel in ("a.txt", os.path.join("sub", "b.txt")):
+            with open(os.path.join(root, rel), 'w', encoding='utf-8') as f:
+                f.write(text)
+
+        summary = bulk.run_bulk_job(root, alphabet, workers=2)
+        assert summary["DONE"] == 2, f"Unexpected summary: {summary}"
+
+        # Simulate a crash after the first block of b.txt
+        rel = os.path.join("sub", "b.txt")
+        path = os.path.join(root, rel)
+        manifest = bulk.load_manifest(root)
+        record = manifest["files"][rel]
+        block = engine.split_chunks(text, alphabet)[:bulk.CHUNKS_PER_BLOCK]
+        record.update({
+            "status": bulk.PARTIAL,
+            "blocks_done": 1,
+            "cipher_bytes": len(engine.join_chunks(block).encode('utf-8')),
+            "keys_bytes": sum(len(c) + 1 for c in block if c[0].upper() in alphabet)
+        })
+        bulk.save_manifest(manifest, root)
+        with open(path + bulk.CIPHER_SUFFIX, 'rb') as f:
+            cipher_prefix = f.read(record["cipher_bytes"])
+        with open(path + bulk.KEYS_SUFFIX, 'rb') as f:
+            keys_prefix = f.read(record["keys_bytes"])
+
+        summary = bulk.run_bulk_job(root, alphabet, workers=2)
+        assert summary["SKIPPED"] == 1 and summary["DONE"] == 1, f"Unexpected summary: {summary}"
+        print(f"  Resume summary: {summary}")
+
+        # The first block must be kept, not re-encrypted with fresh keys
+        with open(path + bulk.CIPHER_SUFFIX, 'rb') as f:
+            assert f.read(record["cipher_bytes"]) == cipher_prefix, "Resumed ciphertext prefix changed"
+        with open(path + bulk.KEYS_SUFFIX, 'rb') as f:
+            assert f.read(record["keys_bytes"]) == keys_prefix, "Resumed keys prefix changed"
+
+        for rel in ("a.txt", os.path.join("sub", "b.txt")):
+            path = os.path.join(root, rel)
+            with open(path + bulk.CIPHER_SUFFIX, 'r', encoding='utf-8') as f:
+                cipher = f.read()
+            keys = engine.load_keys(path + bulk.KEYS_SUFFIX)
+            dec, _ = engine.decrypt_sentence(cipher, keys, alphabet)
+            assert dec == text, f"Round trip failed for {rel}"
+
+        # A PARTIAL checkpoint whose outputs vanished must restart, not pad with NULs
+        manifest = bulk.load_manifest(root)
+        manifest["files"]["a.txt"].update({"status": bulk.PARTIAL, "blocks_done": 1, "cipher_bytes": 500})
+        bulk.save_manifest(manifest, root)
+        os.remove(os.path.join(root, "a.txt" + bulk.CIPHER_SUFFIX))
+        os.remove(os.path.join(root, "a.txt" + bulk.KEYS_SUFFIX))
+        summary = bulk.run_bulk_job(root, alphabet, workers=2)
+        assert summary["DONE"] == 1, f"Unexpected summary: {summary}"
+        path = os.path.join(root, "a.txt")
+        with open(path + bulk.CIPHER_SUFFIX, 'r', encoding='utf-8') as f:
+            cipher = f.read()
+        assert "\0" not in cipher, "Resumed output was padded with NULs"
+        dec, _ = engine.decrypt_sentence(cipher, engine.load_keys(path + bulk.KEYS_SUFFIX), alphabet)
+        assert dec == text, "Round trip failed after restarting a.txt"
+
+        # A DONE file whose output was deleted must be encrypted again, not skipped
+        os.remove(os.path.join(root, "a.txt" + bulk.CIPHER_SUFFIX))
+        summary = bulk.run_bulk_job(root, alphabet, workers=2)
+        assert summary["DONE"] == 1 and summary["SKIPPED"] == 1, f"Unexpected summary: {summary}"
+        assert os.path.exists(path + bulk.CIPHER_SUFFIX), "Deleted output was not rewritten"
+    print("  >> Bulk Job PASSED")
+
+def test_verify_project():
+    print("--- Verify Verification ---")
+    alphabet = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    entries = []
+    for text in ("Hello World", "Attack at Dawn!", "Nothing to see here."):
+        enc, keys, mapping = engine.encrypt_sentence_otp(text, alphabet)
+        entries.append({"msg": text, "result": enc, "keys": keys, "mapping": mapping, "status": "ENCODED"})
+
+    # Tamper with one ciphertext
+    first = entries[1]["result"][0]
+    entries[1]["result"] = ("B" if first == "A" else "A") + entries[1]["result"][1:]
+    # Entry encrypted before the project shift changed: checked with its own shift
+    enc, keys, mapping = engine.encrypt_sentence_otp("Shifted earlier", alphabet, 3)
+    entries.append({"msg": "Shifted earlier", "result": enc, "keys": keys, "mapping": mapping,
+                    "status": "ENCODED", "alphabet": alphabet, "shift": 3})
+
+    # Malformed entry must be reported, not crash the run
+    entries.append({"msg": "Hi", "result": "Xy", "keys": None, "mapping": [], "status": "ENCODED"})
+    project = {"name": "ops", "entries": entries, "alphabet": alphabet, "shift": 1}
+
+    report = engine.verify_project(project, workers=2)
+    print(f"  Report: {report}")
+    assert report["checked"] == 5, "All entries should be checked"
+    assert [c["index"] for c in report["corrupt"]] == [1, 4], f"Entries 1 and 4 are corrupt: {report['corrupt']}"
+    assert "malformed entry" in report["corrupt"][1]["problems"][0], "Malformed entry should be named"
+    print("  >> Verify PASSED")
+
+def test_word_case_tables():
+    print("--- Word Case Verification ---")
+    alphabet = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    table = engine.build_table(alphabet)
+
+    # Mixed case (bulk case restore) and passthrough chars (per-char path)
+    cases = [
+        ("HeLLo", "LEMON", "SiXZb"),
+        ("hello", "LEMON", "sixzb"),
+        ("It's", "ABCD", "Iu'v"),
+        ("Año", "ABC", "Añq"),
+    ]
+    for word, key, expected in cases:
+        enc, _ = engine.encrypt_word(word, key, table, alphabet)
+        assert enc == expected, f"encrypt_word({word!r}) = {enc!r}, expected {expected!r}"
+        dec = engine.decrypt_word(enc, key, table, alphabet)
+        assert dec == word, f"decrypt_word({enc!r}) = {dec!r}, expected {word!r}"
+
+    # Lowercase is restored per char: no Greek final-sigma rule ('σ' must stay 'σ')
+    greek = ['Ä', 'B', 'C', 'Σ']
+    dec = engine.decrypt_word('σc', 'Σσﬀςy', engine.build_table(greek), greek)
+    assert dec == 'äσ', f"Context-sensitive lowercase leaked in: {dec!r}"
+
+    # Alphabet chars whose lowercase is several chars ('İ' -> 'i̇') must not break the tables
+    turkish = ['İ', 'I', 'Σ']
+    enc, _ = engine.encrypt_word("Iσ", "IΣ", engine.build_table(turkish), turkish)
+    assert engine.decrypt_word(enc, "IΣ", engine.build_table(turkish), turkish) == "Iσ", "Round trip failed"
+    print("  >> Word Case PASSED")
+
 if __name__ == "__main__":
     test_final_polish()
+    test_pipeline_rounds()
+    test_incremental_reencryption()
+    test_bulk_resume()
+    test_verify_project()
+    test_word_case_tables()